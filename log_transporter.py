@@ -5,19 +5,26 @@ via an intermediate host, avoiding duplicate data using offset tracking.
 """
 
 import os
+import posixpath
 import sys
-import json
 import time
 import yaml
 import logging
 import argparse
-import hashlib
+import shlex
+import shutil
+import socket
+import subprocess
+import threading
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import paramiko
 
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.backends import default_backend
 import io
 
@@ -27,7 +34,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Parsed private keys keyed by (path, mtime), shared by all connections
+_KEY_CACHE = {}
+
 STATE_FILE = '/app/state/transfer_state.json'
+RSYNC_CACHE_DIR = '/app/state/mirror'
+READ_CHUNK_SIZE = 1 << 20
+SFTP_WINDOW_SIZE = 4 << 20
+SFTP_MAX_REQUESTS = 64
+# Defaults sized for the 256M / 0.5 CPU limits in docker-compose.yml. Each
+# active copy can hold ~6MB: a 4MB channel window of received and prefetched
+# data, the 1MB copy chunk and pending destination writes.
+MAX_SOURCE_WORKERS = 4
+SFTP_CHANNELS_PER_SOURCE = 4
+MAX_CONCURRENT_TRANSFERS = 8
+KEEPALIVE_INTERVAL = 30
+STATE_COMPACT_INTERVAL = 1000
+EXEC_OUTPUT_LIMIT = 4096
+# rsync gives up after this long without I/O; the whole run is killed after RSYNC_TIMEOUT
+RSYNC_IO_TIMEOUT = 60
+RSYNC_TIMEOUT = 3600
+SOCKET_BUFFER_SIZE = 32 << 20
+PREFERRED_CIPHERS = ('aes128-gcm@openssh.com', 'aes256-gcm@openssh.com', 'aes128-ctr', 'aes256-ctr')
 
 @dataclass
 class SourceServer:
@@ -37,6 +65,10 @@ class SourceServer:
     ssh_key: str
     log_paths: list
     port: int = 22
+    # Filled in by LogTransporter._parse_sources: the destination directory and
+    # (log_path, dest_file) pairs, computed once instead of every cycle
+    dest_dir: str = ''
+    log_files: list = field(default_factory=list)
 
 @dataclass
 class DestServer:
@@ -47,27 +79,107 @@ class DestServer:
     port: int = 22
 
 class TransferState:
-    """Tracks file offsets to avoid duplicating log data."""
+    """Tracks file offsets to avoid duplicating log data.
+
+    Updates are appended to a journal next to the state file and replayed on
+    load; the full state file is only rewritten once the journal grows past
+    STATE_COMPACT_INTERVAL entries or on close.
+    """
     def __init__(self, state_file: str = STATE_FILE):
         self.state_file = state_file
+        self.journal_file = os.path.splitext(state_file)[0] + '.log'
+        self._journal = None
+        self._journal_entries = 0
         self.state = self._load()
+        # Sources are transferred from worker threads
+        self._lock = threading.Lock()
 
     def _load(self) -> dict:
+        state = {}
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                with open(self.state_file, 'rb') as f:
+                    state = self._migrate(orjson.loads(f.read()))
+            except (orjson.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not load state file: {e}")
-        return {}
+        if os.path.exists(self.journal_file):
+            try:
+                good_end = 0
+                with open(self.journal_file, 'rb') as f:
+                    for line in f:
+                        # A line without its newline is torn even if it parses
+                        if not line.endswith(b'\n'):
+                            break
+                        try:
+                            state.update(orjson.loads(line))
+                        except orjson.JSONDecodeError:
+                            break
+                        good_end += len(line)
+                        self._journal_entries += 1
+                    torn = f.seek(0, os.SEEK_END) > good_end
+                if torn:
+                    # Drop the partial write from a crash so later appends start on a
+                    # fresh line instead of being glued onto it
+                    logger.warning("Discarding torn entry at end of state journal")
+                    os.truncate(self.journal_file, good_end)
+            except IOError as e:
+                logger.warning(f"Could not replay state journal: {e}")
+        return state
+
+    def _migrate(self, state: dict) -> dict:
+        """Re-key entries saved under the old MD5 keys using their server and path fields."""
+        migrated = {}
+        for key, entry in state.items():
+            if 'server' in entry and 'path' in entry:
+                key = self.get_key(entry['server'], entry['path'])
+            migrated[key] = entry
+        return migrated
 
     def save(self):
+        """Make this cycle's updates durable, compacting once the journal has grown large enough."""
+        with self._lock:
+            if self._journal_entries >= STATE_COMPACT_INTERVAL:
+                self._compact()
+            elif self._journal:
+                os.fsync(self._journal.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._journal_entries:
+                self._compact()
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
+    def _compact(self):
+        """Atomically rewrite the state file, then truncate the journal."""
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(self.state))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+        # The rename must be durable before the journal is truncated, otherwise a
+        # power loss can keep the truncate but lose the rename
+        _fsync_dir(os.path.dirname(self.state_file))
+        # Replaying the journal over the new state file is harmless, so a crash
+        # before the truncate below loses nothing
+        if self._journal:
+            self._journal.close()
+        self._journal = open(self.journal_file, 'wb', buffering=0)
+        self._journal_entries = 0
+
+    def _append_journal(self, key: str, entry: dict):
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.journal_file), exist_ok=True)
+            # Unbuffered so every update reaches the file as it happens
+            self._journal = open(self.journal_file, 'ab', buffering=0)
+        self._journal.write(orjson.dumps({key: entry}) + b'\n')
+        self._journal_entries += 1
 
     def get_key(self, server_name: str, log_path: str) -> str:
-        return hashlib.md5(f"{server_name}:{log_path}".encode()).hexdigest()
+        return f"{server_name}\x00{log_path}"
 
     def get_offset(self, server_name: str, log_path: str) -> int:
         key = self.get_key(server_name, log_path)
@@ -77,15 +189,84 @@ class TransferState:
         key = self.get_key(server_name, log_path)
         return self.state.get(key, {}).get('inode', 0)
 
-    def update(self, server_name: str, log_path: str, offset: int, inode: int):
+    def get_dest_size(self, server_name: str, log_path: str, default=0) -> int:
+        key = self.get_key(server_name, log_path)
+        return self.state.get(key, {}).get('dest_size', default)
+
+    def has(self, server_name: str, log_path: str) -> bool:
+        return self.get_key(server_name, log_path) in self.state
+
+    def update(self, server_name: str, log_path: str, offset: int, inode: int, dest_size: int):
         key = self.get_key(server_name, log_path)
-        self.state[key] = {
+        entry = {
             'server': server_name,
             'path': log_path,
             'offset': offset,
             'inode': inode,
-            'updated': datetime.utcnow().isoformat()
+            'dest_size': dest_size,
+            'updated': datetime.utcnow()
         }
+        with self._lock:
+            self.state[key] = entry
+            self._append_journal(key, entry)
+
+def _fsync_dir(path: str):
+    """Flush a directory entry change such as a rename to disk."""
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _kernel_limit(path: str) -> int:
+    """Read a numeric sysctl; an unreadable one (e.g. non-Linux) lets the full size be tried."""
+    try:
+        with open(path) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return SOCKET_BUFFER_SIZE
+
+def _tune_socket(sock: socket.socket):
+    """Apply transfer tuning options; a failure only costs performance, never the connection."""
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    if _kernel_limit('/proc/sys/net/core/wmem_max') >= SOCKET_BUFFER_SIZE:
+        options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE))
+    if _kernel_limit('/proc/sys/net/core/rmem_max') >= SOCKET_BUFFER_SIZE:
+        options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE))
+    for level, option, value in options:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError as e:
+            # e.g. ENOBUFS on BSD/macOS when the buffer exceeds kern.ipc.maxsockbuf
+            logger.debug("Could not set socket option %s=%s: %s", option, value, e)
+
+def _open_socket(host: str, port: int, timeout: float) -> socket.socket:
+    """Connect a TCP socket tuned for bulk transfer over high-latency links.
+
+    Buffer sizes must be set before connect() for the TCP window scale to cover
+    them. Linux caps them at net.core.[rw]mem_max and disables autotuning once
+    they are set, so they are only set when the kernel allows the full size.
+    """
+    error = None
+    for family, sock_type, proto, _, addr in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM):
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            _tune_socket(sock)
+            sock.settimeout(timeout)
+            sock.connect(addr)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error or OSError(f"Could not resolve {host}")
+
+def _make_transport(sock, **kwargs) -> paramiko.Transport:
+    """Create a Transport that offers AEAD/CTR ciphers ahead of CBC during negotiation."""
+    transport = paramiko.Transport(sock, **kwargs)
+    options = transport.get_security_options()
+    supported = options.ciphers
+    options.ciphers = [c for c in PREFERRED_CIPHERS if c in supported] + [c for c in supported if c not in PREFERRED_CIPHERS]
+    return transport
 
 class SSHConnection:
     """Manages SSH connections with key-based authentication."""
@@ -94,7 +275,15 @@ class SSHConnection:
         self.client = None
 
     def _load_key(self, path: str):
-        """Load SSH key, handling PKCS#8, OpenSSH, and PEM formats."""
+        """Load SSH key, reusing the parsed key until the file changes."""
+        cache_key = (path, os.stat(path).st_mtime_ns)
+        key = _KEY_CACHE.get(cache_key)
+        if key is None:
+            key = _KEY_CACHE[cache_key] = self._parse_key(path)
+        return key
+
+    def _parse_key(self, path: str):
+        """Parse SSH key, handling PKCS#8, OpenSSH, and PEM formats."""
         with open(path, 'rb') as f:
             key_data = f.read()
         
@@ -102,6 +291,14 @@ class SSHConnection:
         if b'BEGIN PRIVATE KEY' in key_data:
             # Load with cryptography and convert to PEM format Paramiko understands
             private_key = serialization.load_pem_private_key(key_data, password=None, backend=default_backend())
+            if isinstance(private_key, ed25519.Ed25519PrivateKey):
+                # Ed25519 has no traditional PEM encoding; go through the OpenSSH format
+                openssh_key = private_key.private_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PrivateFormat.OpenSSH,
+                    encryption_algorithm=serialization.NoEncryption()
+                )
+                return paramiko.Ed25519Key(file_obj=io.StringIO(openssh_key.decode('utf-8')))
             pem_key = private_key.private_bytes(
                 encoding=serialization.Encoding.PEM,
                 format=serialization.PrivateFormat.TraditionalOpenSSL,
@@ -110,32 +307,47 @@ class SSHConnection:
             key_file = io.StringIO(pem_key.decode('utf-8'))
             return paramiko.RSAKey.from_private_key(key_file)
         
-        # Otherwise let Paramiko handle it directly
-        return None
+        # Otherwise let Paramiko detect the key type
+        return paramiko.PKey.from_path(path)
 
     def connect(self):
         self.client = paramiko.SSHClient()
         self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         
-        key = self._load_key(self.key_path)
-        if key:
-            self.client.connect(self.host, port=self.port, username=self.username, pkey=key, timeout=30)
-        else:
-            self.client.connect(self.host, port=self.port, username=self.username, key_filename=self.key_path, timeout=30)
-        
+        # Logs are highly compressible text, so zlib on the wire pays for itself
+        self.client.connect(
+            self.host, port=self.port, username=self.username, timeout=30,
+            pkey=self._load_key(self.key_path), sock=_open_socket(self.host, self.port, timeout=30),
+            compress=True, transport_factory=_make_transport
+        )
+
+        # Keep idle connections alive between cycles in continuous mode
+        self.client.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
         logger.info(f"Connected to {self.host}")
 
+    def is_active(self) -> bool:
+        transport = self.client.get_transport() if self.client else None
+        return transport is not None and transport.is_active()
+
     def close(self):
         if self.client:
             self.client.close()
             logger.info(f"Disconnected from {self.host}")
 
-    def exec_command(self, cmd: str) -> tuple:
+    def exec_small(self, cmd: str, max_bytes: int = EXEC_OUTPUT_LIMIT) -> tuple:
+        """Run a command with small expected output, reading at most max_bytes of stdout and stderr."""
         stdin, stdout, stderr = self.client.exec_command(cmd)
-        return stdout.read().decode(), stderr.read().decode(), stdout.channel.recv_exit_status()
+        out = stdout.read(max_bytes + 1)
+        if len(out) > max_bytes:
+            # Don't wait for the exit status of a command still producing output
+            stdout.channel.close()
+            logger.warning(f"Command output on {self.host} exceeded {max_bytes} bytes, truncated")
+            return out[:max_bytes].decode(errors='replace'), '', -1
+        return out.decode(), stderr.read(max_bytes).decode(), stdout.channel.recv_exit_status()
 
     def get_sftp(self):
-        return self.client.open_sftp()
+        # Larger channel window keeps prefetched reads flowing on high-latency links
+        return paramiko.SFTPClient.from_transport(self.client.get_transport(), window_size=SFTP_WINDOW_SIZE)
 
     def __enter__(self):
         self.connect()
@@ -147,20 +359,58 @@ class SSHConnection:
 class LogTransporter:
     def __init__(self, config_path: str):
         self.config = self._load_config(config_path)
-        self.sources = self._parse_sources()
         self.dest = self._parse_destination()
+        self.sources = self._parse_sources()
         self.state = TransferState()
         self.interval = self.config.get('interval', 0)
+        # Connections cached across cycles, keyed by source name; each source
+        # gets its own destination connection
+        self._src_conns = {}
+        self._dest_conns = {}
+        # Destination directories known to exist
+        self._created_dirs = set()
+        # Sources whose destination sizes have been checked against state
+        self._verified_sources = set()
+        # (source name, log path) whose destination may hold bytes from an
+        # interrupted copy; checked against dest_size before the next append
+        self._unverified_logs = set()
+        # Concurrency: sources in parallel, SFTP channels per source, and
+        # outstanding read requests per file
+        self.max_workers = self._positive_int('max_workers', MAX_SOURCE_WORKERS)
+        self.sftp_channels = self._positive_int('sftp_channels', SFTP_CHANNELS_PER_SOURCE)
+        self.sftp_max_requests = self._positive_int('sftp_max_requests', SFTP_MAX_REQUESTS)
+        # Caps copies in flight across all sources, bounding total buffer memory
+        self._transfer_slots = threading.BoundedSemaphore(
+            self._positive_int('max_transfers', MAX_CONCURRENT_TRANSFERS)
+        )
+        self.use_rsync = self.config.get('use_rsync', False)
+        self.rsync_cache_dir = self.config.get('rsync_cache_dir', RSYNC_CACHE_DIR)
+        if self.use_rsync and shutil.which('rsync') is None:
+            logger.warning("use_rsync is set but rsync is not installed, using SFTP")
+            self.use_rsync = False
 
     def _load_config(self, path: str) -> dict:
         with open(path, 'r') as f:
             return yaml.safe_load(f)
 
+    def _positive_int(self, name: str, default: int) -> int:
+        """Read a concurrency setting; zero would stall transfers (e.g. prefetch with no requests)."""
+        value = self.config.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"Config option '{name}' must be a positive integer, got {value!r}")
+        return value
+
     def _parse_sources(self) -> list:
-        return [SourceServer(
-            name=s['name'], host=s['host'], username=s['username'],
-            ssh_key=s['ssh_key'], log_paths=s['log_paths'], port=s.get('port', 22)
-        ) for s in self.config['sources']]
+        sources = []
+        for s in self.config['sources']:
+            dest_dir = f"{self.dest.base_path}/{s['name']}"
+            sources.append(SourceServer(
+                name=s['name'], host=s['host'], username=s['username'],
+                ssh_key=s['ssh_key'], log_paths=s['log_paths'], port=s.get('port', 22),
+                dest_dir=dest_dir,
+                log_files=[(p, f"{dest_dir}/{os.path.basename(p)}") for p in s['log_paths']]
+            ))
+        return sources
 
     def _parse_destination(self) -> DestServer:
         d = self.config['destination']
@@ -168,60 +418,172 @@ class LogTransporter:
 
     def get_file_info(self, ssh: SSHConnection, path: str) -> tuple:
         """Get file size and inode to detect rotation."""
-        out, err, code = ssh.exec_command(f"stat -c '%s %i' {path} 2>/dev/null || echo '0 0'")
-        parts = out.strip().split()
-        return (int(parts[0]), int(parts[1])) if len(parts) == 2 else (0, 0)
-
-    def read_log_chunk(self, ssh: SSHConnection, path: str, offset: int, size: int) -> bytes:
+        return self._batch_file_info(ssh, [path]).get(path, (0, 0))
+
+    def _batch_file_info(self, ssh: SSHConnection, paths: list) -> dict:
+        """Get (size, inode) for many files with one stat call; missing files are left out.
+
+        This stays a shell command rather than SFTP stat because SFTP v3
+        attributes carry no inode, which rotation detection depends on.
+        """
+        if not paths:
+            return {}
+        # Each output line is the path plus at most 43 bytes of size, inode and separators
+        out, err, code = ssh.exec_small(
+            "stat -c '%s %i %n' -- " + " ".join(shlex.quote(p) for p in paths) + " 2>/dev/null",
+            max_bytes=sum(len(p.encode()) + 48 for p in paths)
+        )
+        info = {}
+        for line in out.splitlines():
+            parts = line.split(' ', 2)
+            if len(parts) == 3:
+                info[parts[2]] = (int(parts[0]), int(parts[1]))
+        return info
+
+    def read_log_chunk(self, sftp, path: str, offset: int, size: int) -> bytes:
         """Read log data from offset, handling large files efficiently."""
         if offset >= size:
             return b''
-        bytes_to_read = size - offset
-        out, err, code = ssh.exec_command(f"tail -c +{offset + 1} {path} | head -c {bytes_to_read}")
-        return out.encode() if isinstance(out, str) else out
+        with sftp.open(path, 'rb') as f:
+            f.seek(offset)
+            f.prefetch(size, max_concurrent_requests=self.sftp_max_requests)
+            return f.read(size - offset)
 
     def transfer_logs(self):
         """Main transfer logic - connects to sources, reads new data, writes to destination."""
         logger.info("Starting log transfer cycle")
-        
-        with SSHConnection(self.dest.host, self.dest.username, self.dest.ssh_key, self.dest.port) as dest_ssh:
-            dest_sftp = dest_ssh.get_sftp()
-            
-            # Ensure base path exists
-            try:
-                dest_sftp.stat(self.dest.base_path)
-            except FileNotFoundError:
-                dest_ssh.exec_command(f"mkdir -p {self.dest.base_path}")
 
-            for source in self.sources:
-                logger.info(f"Processing source: {source.name} ({source.host})")
-                server_dest_dir = f"{self.dest.base_path}/{source.name}"
-                dest_ssh.exec_command(f"mkdir -p {server_dest_dir}")
+        # Each source runs on its own thread so connect handshakes and transfers overlap
+        workers = max(1, min(self.max_workers, len(self.sources)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self._handle_source, self.sources))
 
-                try:
-                    with SSHConnection(source.host, source.username, source.ssh_key, source.port) as src_ssh:
-                        for log_path in source.log_paths:
-                            try:
-                                self._transfer_single_log(src_ssh, dest_ssh, dest_sftp, source, log_path, server_dest_dir)
-                            except Exception as e:
-                                logger.error(f"Error transferring {log_path}: {type(e).__name__}: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to connect to {source.name}: {e}")
-                    continue
-
-            dest_sftp.close()
-        
         self.state.save()
         logger.info("Transfer cycle complete")
 
-    def _transfer_single_log(self, src_ssh, dest_ssh, dest_sftp, source, log_path, dest_dir):
+    def _get_conn(self, cache: dict, name: str, server) -> SSHConnection:
+        """Return the cached connection for name, connecting if it is missing or has dropped."""
+        conn = cache.get(name)
+        if conn is None or not conn.is_active():
+            if conn:
+                conn.close()
+            conn = SSHConnection(server.host, server.username, server.ssh_key, server.port)
+            conn.connect()
+            cache[name] = conn
+        return conn
+
+    def _drop_conns(self, name: str):
+        """Close and forget the cached connections used by a source."""
+        for cache in (self._src_conns, self._dest_conns):
+            conn = cache.pop(name, None)
+            if conn:
+                conn.close()
+
+    def close(self):
+        """Close every cached connection and flush transfer state."""
+        for source in self.sources:
+            self._drop_conns(source.name)
+        self.state.close()
+
+    def _handle_source(self, source: SourceServer):
+        """Transfer every log of one source over dedicated source and destination connections."""
+        logger.info("Processing source: %s (%s)", source.name, source.host)
+
+        # Connections are reused across cycles; if a cached one turns out to be
+        # dead, reconnect and retry the source once.
+        for attempt in range(2):
+            try:
+                dest_ssh = self._get_conn(self._dest_conns, source.name, self.dest)
+                src_ssh = self._get_conn(self._src_conns, source.name, source)
+                if source.name not in self._verified_sources:
+                    self._verify_dest_sizes(dest_ssh, source)
+                    self._verified_sources.add(source.name)
+                # One stat round trip for all of the source's logs
+                file_info = self._batch_file_info(src_ssh, source.log_paths)
+                # Spread the logs over several SFTP channels on the same transports
+                channels = max(1, min(self.sftp_channels, len(source.log_files)))
+                with ThreadPoolExecutor(max_workers=channels) as executor:
+                    list(executor.map(
+                        lambda i: self._transfer_log_group(
+                            src_ssh, dest_ssh, source, source.log_files[i::channels], file_info
+                        ),
+                        range(channels)
+                    ))
+                return
+            except (paramiko.SSHException, EOFError, OSError) as e:
+                self._drop_conns(source.name)
+                if attempt == 0:
+                    logger.warning("Connection problem with %s: %s, reconnecting", source.name, e)
+                    continue
+                logger.error("Failed to connect to %s: %s", source.name, e)
+            except Exception as e:
+                self._drop_conns(source.name)
+                logger.error("Failed to connect to %s: %s", source.name, e)
+                return
+
+    def _transfer_log_group(self, src_ssh, dest_ssh, source, log_files, file_info):
+        """Transfer a group of logs sequentially over one source and one destination SFTP channel."""
+        with src_ssh.get_sftp() as src_sftp, dest_ssh.get_sftp() as dest_sftp:
+            for log_path, dest_file in log_files:
+                try:
+                    self._transfer_single_log(src_sftp, dest_sftp, source, log_path, dest_file, file_info)
+                except (paramiko.SSHException, EOFError, OSError) as e:
+                    # A dropped connection would fail every remaining log; hand it to
+                    # _handle_source to reconnect and retry. SFTP status errors (missing
+                    # file, permission denied) are OSErrors on a live transport.
+                    if not isinstance(e, OSError) or not (src_ssh.is_active() and dest_ssh.is_active()):
+                        raise
+                    logger.error("Error transferring %s: %s: %s", log_path, type(e).__name__, e)
+                    self._created_dirs.discard(source.dest_dir)
+                except Exception as e:
+                    logger.error("Error transferring %s: %s: %s", log_path, type(e).__name__, e)
+                    # The directory may have been removed on the destination; check again next time
+                    self._created_dirs.discard(source.dest_dir)
+
+    def _ensure_dir(self, sftp, path: str):
+        """Create a destination directory and its parents over SFTP, once per process."""
+        if path in self._created_dirs:
+            return
+        try:
+            sftp.stat(path)
+        except FileNotFoundError:
+            parent = posixpath.dirname(path)
+            if parent and parent != path:
+                self._ensure_dir(sftp, parent)
+            try:
+                sftp.mkdir(path)
+            except IOError:
+                # Another worker may have created it first
+                sftp.stat(path)
+            logger.info("Created directory: %s", path)
+        self._created_dirs.add(path)
+
+    def _verify_dest_sizes(self, dest_ssh, source):
+        """Check destination file sizes against state once per process with one batched stat."""
+        dest_info = self._batch_file_info(dest_ssh, [dest_file for _, dest_file in source.log_files])
+        for log_path, dest_file in source.log_files:
+            if not self.state.has(source.name, log_path):
+                continue
+            # Entries saved before dest_size was tracked adopt the real size silently
+            recorded = self.state.get_dest_size(source.name, log_path, default=None)
+            actual = dest_info.get(dest_file, (0, 0))[0]
+            if recorded is not None and actual > recorded:
+                # Most likely a copy interrupted by a crash; trimmed before the next append
+                self._unverified_logs.add((source.name, log_path))
+            elif actual != recorded:
+                if recorded is not None:
+                    logger.warning("Destination %s is %d bytes, expected %d; it was changed outside the transporter",
+                                   dest_file, actual, recorded)
+                self.state.update(
+                    source.name, log_path, self.state.get_offset(source.name, log_path),
+                    self.state.get_inode(source.name, log_path), actual
+                )
+
+    def _transfer_single_log(self, src_sftp, dest_sftp, source, log_path, dest_file, file_info):
         """Transfer a single log file, handling rotation and deduplication."""
-        log_name = os.path.basename(log_path)
-        dest_file = f"{dest_dir}/{log_name}"
-        
-        current_size, current_inode = self.get_file_info(src_ssh, log_path)
+        current_size, current_inode = file_info.get(log_path, (0, 0))
         if current_size == 0:
-            logger.warning(f"Log file not found or empty: {log_path}")
+            logger.warning("Log file not found or empty: %s", log_path)
             return
 
         saved_offset = self.state.get_offset(source.name, log_path)
@@ -229,59 +591,121 @@ class LogTransporter:
 
         # Detect log rotation (inode changed or file smaller than offset)
         if saved_inode != current_inode or current_size < saved_offset:
-            logger.info(f"Log rotation detected for {log_path}, resetting offset")
+            logger.info("Log rotation detected for %s, resetting offset", log_path)
             saved_offset = 0
 
         if saved_offset >= current_size:
-            logger.info(f"No new data in {log_path} (offset {saved_offset} >= size {current_size})")
+            logger.info("No new data in %s (offset %d >= size %d)", log_path, saved_offset, current_size)
             return
 
-        # Read new log data from source
-        new_data, _, _ = src_ssh.exec_command(f"tail -c +{saved_offset + 1} '{log_path}'")
-        if not new_data:
-            return
+        logger.info("Transferring %d bytes from %s:%s", current_size - saved_offset, source.name, log_path)
 
-        new_bytes = len(new_data.encode())
-        logger.info(f"Transferring {new_bytes} bytes from {source.name}:{log_path}")
+        self._ensure_dir(dest_sftp, source.dest_dir)
 
-        # Ensure destination directory exists
-        dest_ssh.exec_command(f"mkdir -p '{dest_dir}'")
-        logger.info(f"Ensured directory exists: {dest_dir}")
-        
-        # Get current size of destination file (0 if doesn't exist)
-        dest_out, _, _ = dest_ssh.exec_command(f"stat -c '%s' '{dest_file}' 2>/dev/null || echo '0'")
-        dest_size = int(dest_out.strip())
-        logger.info(f"Destination file size: {dest_size}, writing to: {dest_file}")
-        
-        # Write using SFTP - open in read/write mode, seek to end
-        mode = 'r+b' if dest_size > 0 else 'wb'
+        # Destination size is tracked in state rather than stat'ed every cycle
+        dest_size = self.state.get_dest_size(source.name, log_path)
+        if (source.name, log_path) in self._unverified_logs:
+            dest_size = self._trim_partial_write(dest_sftp, dest_file, dest_size)
+            self._unverified_logs.discard((source.name, log_path))
+        logger.info("Destination file size: %d, writing to: %s", dest_size, dest_file)
+
+        new_offset = None
+        try:
+            with self._transfer_slots:
+                if self.use_rsync:
+                    new_offset = self._copy_via_rsync(source, log_path, dest_sftp, dest_file, saved_offset)
+                if new_offset is None:
+                    new_offset = self._copy_via_sftp(src_sftp, dest_sftp, log_path, dest_file, saved_offset, current_size)
+        except BaseException:
+            # Part of the range may already be appended; the retry must not append it twice
+            self._unverified_logs.add((source.name, log_path))
+            raise
+        logger.info("Successfully wrote %d bytes to %s", new_offset - saved_offset, dest_file)
+
+        self.state.update(source.name, log_path, new_offset, current_inode, dest_size + new_offset - saved_offset)
+
+    def _trim_partial_write(self, dest_sftp, dest_file, dest_size) -> int:
+        """Cut a destination file back to the size recorded in state; returns the size to append at."""
+        try:
+            actual = dest_sftp.stat(dest_file).st_size
+        except FileNotFoundError:
+            actual = 0
+        if actual > dest_size:
+            logger.warning("Removing %d bytes of interrupted copy from %s", actual - dest_size, dest_file)
+            dest_sftp.truncate(dest_file, dest_size)
+            return dest_size
+        if actual < dest_size:
+            logger.warning("Destination %s is %d bytes, expected %d; it was changed outside the transporter",
+                           dest_file, actual, dest_size)
+        return actual
+
+    def _copy_via_sftp(self, src_sftp, dest_sftp, log_path, dest_file, saved_offset, current_size) -> int:
+        """Stream the source log from saved_offset into the destination; returns the new offset."""
+        # 'ab' appends at the end of the remote file, and the offset returned is
+        # how far the source was actually read, so data appended mid-copy is not
+        # sent twice.
+        with src_sftp.open(log_path, 'rb') as src_f, dest_sftp.open(dest_file, 'ab') as dest_f:
+            src_f.seek(saved_offset)
+            src_f.prefetch(current_size, max_concurrent_requests=self.sftp_max_requests)
+            dest_f.set_pipelined(True)
+            shutil.copyfileobj(src_f, dest_f, READ_CHUNK_SIZE)
+            return src_f.tell()
+
+    def _copy_via_rsync(self, source, log_path, dest_sftp, dest_file, saved_offset):
+        """Pull the source log into a local mirror with rsync --append, then upload the new range.
+
+        Returns the new offset, or None if rsync failed and the caller should
+        fall back to SFTP.
+        """
+        mirror = os.path.join(self.rsync_cache_dir, source.name, log_path.lstrip('/'))
+        os.makedirs(os.path.dirname(mirror), exist_ok=True)
+        # A rotated or new log starts over; --append would keep the old mirror's bytes
+        if saved_offset == 0 and os.path.exists(mirror):
+            os.remove(mirror)
+
+        # One multiplexed ssh master per source, kept open until the next cycle,
+        # so each log does not pay a fresh handshake
+        control_path = os.path.join(self.rsync_cache_dir, '.ssh-%C')
+        ssh_cmd = (f"ssh -i {shlex.quote(source.ssh_key)} -p {source.port} -o BatchMode=yes "
+                   f"-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null "
+                   f"-o ConnectTimeout=30 -o ServerAliveInterval={KEEPALIVE_INTERVAL} "
+                   f"-o ControlMaster=auto -o ControlPersist={self.interval + 60} "
+                   f"-o ControlPath={shlex.quote(control_path)}")
         try:
-            with dest_sftp.open(dest_file, mode) as f:
-                if dest_size > 0:
-                    f.seek(0, 2)  # Seek to end
-                f.write(new_data.encode() if isinstance(new_data, str) else new_data)
-            logger.info(f"Successfully wrote to {dest_file}")
-        except IOError as e:
-            logger.warning(f"IOError on first attempt: {e}, trying fallback")
-            # Fallback: create new file
-            with dest_sftp.open(dest_file, 'wb') as f:
-                f.write(new_data.encode() if isinstance(new_data, str) else new_data)
-            logger.info(f"Successfully wrote to {dest_file} via fallback")
-
-        self.state.update(source.name, log_path, current_size, current_inode)
+            result = subprocess.run(
+                ['rsync', '--append', '--protect-args', f'--timeout={RSYNC_IO_TIMEOUT}', '-e', ssh_cmd,
+                 f"{source.username}@{source.host}:{log_path}", mirror],
+                capture_output=True, text=True, timeout=RSYNC_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning("rsync timed out after %ds for %s:%s, falling back to SFTP",
+                           RSYNC_TIMEOUT, source.name, log_path)
+            return None
+        if result.returncode != 0:
+            logger.warning("rsync failed for %s:%s (%s), falling back to SFTP", source.name, log_path, result.stderr.strip())
+            return None
+
+        with open(mirror, 'rb') as src_f, dest_sftp.open(dest_file, 'ab') as dest_f:
+            src_f.seek(saved_offset)
+            dest_f.set_pipelined(True)
+            shutil.copyfileobj(src_f, dest_f, READ_CHUNK_SIZE)
+            return src_f.tell()
 
     def run(self, continuous: bool = False):
         """Run transfer once or continuously based on interval."""
-        if continuous and self.interval > 0:
-            logger.info(f"Running in continuous mode with {self.interval}s interval")
-            while True:
-                try:
-                    self.transfer_logs()
-                except Exception as e:
-                    logger.error(f"Transfer cycle failed: {e}")
-                time.sleep(self.interval)
-        else:
-            self.transfer_logs()
+        try:
+            if continuous and self.interval > 0:
+                logger.info(f"Running in continuous mode with {self.interval}s interval")
+                while True:
+                    try:
+                        self.transfer_logs()
+                    except Exception as e:
+                        logger.error(f"Transfer cycle failed: {e}")
+                    time.sleep(self.interval)
+            else:
+                self.transfer_logs()
+        finally:
+            self.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Transfer logs between servers')
@@ -293,7 +717,11 @@ def main():
         logger.error(f"Config file not found: {args.config}")
         sys.exit(1)
 
-    transporter = LogTransporter(args.config)
+    try:
+        transporter = LogTransporter(args.config)
+    except ValueError as e:
+        logger.error(f"Invalid config: {e}")
+        sys.exit(1)
     transporter.run(continuous=args.continuous)
 
 if __name__ == '__main__':
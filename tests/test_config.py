@@ -0,0 +1,38 @@
+import pytest
+
+from log_transporter import LogTransporter
+
+CONFIG = """
+sources:
+  - name: web-1
+    host: 192.0.2.10
+    username: loguser
+    ssh_key: /app/keys/source1_key
+    log_paths: [/var/log/nginx/access.log]
+destination:
+  host: 192.0.2.50
+  username: logcollector
+  ssh_key: /app/keys/dest_key
+  base_path: /logs/collected
+"""
+
+
+@pytest.mark.parametrize('option', ['max_workers', 'sftp_channels', 'max_transfers', 'sftp_max_requests'])
+@pytest.mark.parametrize('value', ['0', '-1', '"8"', 'true'])
+def test_rejects_invalid_concurrency_settings(tmp_path, option, value):
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG + f"{option}: {value}\n")
+
+    with pytest.raises(ValueError, match=option):
+        LogTransporter(str(config))
+
+
+def test_concurrency_defaults(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG)
+
+    transporter = LogTransporter(str(config))
+
+    assert transporter.max_workers == 4
+    assert transporter.sftp_channels == 4
+    assert transporter.sftp_max_requests == 64
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from log_transporter import LogTransporter, TransferState
+
+
+class LocalFile:
+    """SFTPFile stand-in over a local file; fail_after makes reads drop like a lost connection."""
+
+    def __init__(self, path, mode, fail_after=None):
+        self.f = open(path, mode)
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.f.close()
+
+    def seek(self, offset):
+        self.f.seek(offset)
+
+    def tell(self):
+        return self.f.tell()
+
+    def prefetch(self, *args, **kwargs):
+        pass
+
+    def set_pipelined(self, pipelined):
+        pass
+
+    def read(self, size=-1):
+        if self.fail_after is not None and self.f.tell() >= self.fail_after:
+            raise EOFError('connection dropped')
+        if self.fail_after is not None:
+            size = min(size, self.fail_after - self.f.tell())
+        return self.f.read(size)
+
+    def write(self, data):
+        self.f.write(data)
+
+
+class LocalSFTP:
+    """SFTPClient stand-in over the local filesystem."""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+
+    def open(self, path, mode):
+        return LocalFile(path, mode, self.fail_after if 'r' in mode else None)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def mkdir(self, path):
+        os.mkdir(path)
+
+    def truncate(self, path, size):
+        os.truncate(path, size)
+
+
+@pytest.fixture
+def transporter(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text(f"""
+sources:
+  - name: web-1
+    host: 192.0.2.10
+    username: loguser
+    ssh_key: /app/keys/source1_key
+    log_paths: [{tmp_path}/src/app.log]
+destination:
+  host: 192.0.2.50
+  username: logcollector
+  ssh_key: /app/keys/dest_key
+  base_path: {tmp_path}/dest
+""")
+    (tmp_path / 'src').mkdir()
+    transporter = LogTransporter(str(config))
+    transporter.state = TransferState(str(tmp_path / 'state' / 'transfer_state.json'))
+    return transporter
+
+
+def test_interrupted_copy_is_not_duplicated(transporter, tmp_path):
+    source = transporter.sources[0]
+    log_path, dest_file = source.log_files[0]
+    data = b''.join(b'line %d\n' % i for i in range(100000))
+    with open(log_path, 'wb') as f:
+        f.write(data)
+    st = os.stat(log_path)
+    file_info = {log_path: (st.st_size, st.st_ino)}
+
+    with pytest.raises(EOFError):
+        transporter._transfer_single_log(
+            LocalSFTP(fail_after=len(data) // 2), LocalSFTP(), source, log_path, dest_file, file_info
+        )
+    assert os.path.getsize(dest_file) > 0
+
+    transporter._transfer_single_log(LocalSFTP(), LocalSFTP(), source, log_path, dest_file, file_info)
+
+    assert os.path.getsize(dest_file) == transporter.state.get_dest_size(source.name, log_path)
+    with open(dest_file, 'rb') as f:
+        assert f.read() == data
@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from log_transporter import TransferState
+
+
+def test_migrates_md5_keys(tmp_path):
+    state_file = tmp_path / 'transfer_state.json'
+    old_key = hashlib.md5(b'web-1:/var/log/app.log').hexdigest()
+    state_file.write_text(json.dumps({
+        old_key: {'server': 'web-1', 'path': '/var/log/app.log', 'offset': 42, 'inode': 7}
+    }, indent=2))
+
+    state = TransferState(str(state_file))
+
+    assert state.get_offset('web-1', '/var/log/app.log') == 42
+    assert state.get_inode('web-1', '/var/log/app.log') == 7
+    assert old_key not in state.state
+
+
+def test_replays_journal_over_state_file(tmp_path):
+    state_file = tmp_path / 'transfer_state.json'
+    state = TransferState(str(state_file))
+    state.update('web-1', '/var/log/app.log', 10, 1, 10)
+    state.update('web-1', '/var/log/app.log', 20, 1, 20)
+    state.save()
+
+    assert TransferState(str(state_file)).get_offset('web-1', '/var/log/app.log') == 20
+
+
+def test_recovers_from_torn_journal_line(tmp_path):
+    state_file = tmp_path / 'transfer_state.json'
+    journal_file = tmp_path / 'transfer_state.log'
+    state = TransferState(str(state_file))
+    state.update('web-1', '/var/log/app.log', 20, 1, 20)
+    state.save()
+    # Simulate a crash part way through writing the next entry
+    with open(journal_file, 'ab') as f:
+        f.write(b'{"web-1\\u0000/var/log/app.log":{"offs')
+
+    state = TransferState(str(state_file))
+    assert state.get_offset('web-1', '/var/log/app.log') == 20
+    state.update('web-1', '/var/log/app.log', 30, 1, 30)
+    state.save()
+
+    state = TransferState(str(state_file))
+    assert state.get_offset('web-1', '/var/log/app.log') == 30
+    assert journal_file.read_bytes().count(b'\n') == 2
+
+
+def test_close_compacts_journal(tmp_path):
+    state_file = tmp_path / 'transfer_state.json'
+    journal_file = tmp_path / 'transfer_state.log'
+    state = TransferState(str(state_file))
+    state.update('web-1', '/var/log/app.log', 10, 1, 10)
+    state.close()
+
+    assert journal_file.read_bytes() == b''
+    assert TransferState(str(state_file)).get_offset('web-1', '/var/log/app.log') == 10